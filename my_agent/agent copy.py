@@ -1,8 +1,32 @@
+import operator
+from dataclasses import dataclass, fields
+from typing import Any, Mapping
+
 from google.adk.agents import SequentialAgent, LlmAgent
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 from google.genai import types
 
+@dataclass
+class CodePipelineState:
+    """
+    Typed, slotted view of the pipeline outputs stored in session state.
+
+    Field names match the sub-agents' output_key values. ADK writes those
+    keys into session.state itself, so this is for callers that read a
+    finished session back, e.g. CodePipelineState.from_state(session.state).
+    """
+    __slots__ = ("generated_code", "review_comments", "refactored_code")
+
+    generated_code: str
+    review_comments: str
+    refactored_code: str
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "CodePipelineState":
+        """Read all pipeline outputs from session state in a single pass."""
+        return cls(**{field.name: state.get(field.name, "") for field in fields(cls)})
+
 # Define specialized agents for a code pipeline
 code_writer = LlmAgent(
     name="CodeWriter",
@@ -56,6 +80,14 @@ events = runner.run(
     new_message=content
 )
 
+_parts_of = operator.attrgetter("content.parts")
+
 for event in events:
-    if event.content:
-        print(f"[{event.author}]: {event.content.parts[0].text}")
\ No newline at end of file
+    try:
+        parts = _parts_of(event)
+    except AttributeError:
+        continue
+    if parts:
+        text = parts[0].text
+        if text and not text.isspace():
+            print(f"[{event.author}]: {text}")
\ No newline at end of file
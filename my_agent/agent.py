@@ -1,92 +1,290 @@
 from google.adk.agents import LlmAgent
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
-from google.genai import types
+from google.genai import errors, types
+import asyncio
+import functools
+import operator
+import random
+import re
+import sys
+import threading
 import time
-from typing import Iterator
+from typing import Iterator, Optional
 from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 
 # Define Google Search tool for agents to access real-time data
 # Using the correct Tool configuration for Google ADK
 
+# Marks an untyped error message as a rate limit (429) error in one scan
+_RATE_LIMIT_RE = re.compile(r"429|rate limit|quota", re.IGNORECASE)
+
+# Resolves event.content.parts in one C-level call; raises AttributeError if content is None
+_parts_of = operator.attrgetter("content.parts")
+
+# Per-turn user messages are built from these instead of re-validating a fresh Part
+_user_content = functools.partial(types.Content, role='user')
+_TEXT_PART_PROTO = types.Part(text="")
+
+# Separator printed after each event of the travel plan
+_DIVIDER = "-" * 60 + "\n"
+
+
+# Agents, tools and the runner are built lazily on first use, so importing this
+# module just for run_with_rate_limit_handling or chat_with_agent stays cheap.
+
+# Shared by every agent: one interned model name and one immutable tool set
+_MODEL = sys.intern("gemini-2.5-flash")
+_SEARCH_TOOLS = (google_search,)
+
+def make_domain_agent(name: str, instruction: str, description: str) -> LlmAgent:
+    """
+    Build a specialist agent that answers from live Google Search results.
+    """
+    return LlmAgent(
+        name=name,
+        model=_MODEL,
+        instruction=instruction,
+        description=description,
+        tools=list(_SEARCH_TOOLS)
+    )
 
 # Specialized sub-agents with web search capabilities
-flight_agent = LlmAgent(
-    name="FlightAgent",
-    model="gemini-2.5-flash",
-    instruction="""You handle flight bookings and information.
-    
-    When searching for flights:
-    1. Use Google Search to find REAL current flight prices and availability
-    2. Search for flights on major booking sites (Google Flights, Kayak, Skyscanner)
-    3. Include airline names, departure/arrival times, duration, and current prices
-    4. Compare multiple options when available
-    5. Mention if prices are approximate and suggest booking sites
-    
-    Always provide actual, current data from your searches, not placeholder information.""",
-    description="Handles flight-related queries with real-time price data",
-    tools=[google_search]
-)
-
-hotel_agent = LlmAgent(
-    name="HotelAgent",
-    model="gemini-2.5-flash",
-    instruction="""You handle hotel bookings and recommendations.
-    
-    When searching for hotels:
-    1. Use Google Search to find REAL current hotel prices and availability
-    2. Search on Booking.com, Hotels.com, Expedia, or hotel websites
-    3. Include hotel names, ratings, amenities, location details, and current prices per night
-    4. Provide multiple options at different price points
-    5. Include guest ratings and reviews when available
+@functools.cache
+def get_flight_agent() -> LlmAgent:
+    """Flight specialist agent (built once)."""
+    return make_domain_agent(
+        name="FlightAgent",
+        instruction="""You handle flight bookings and information.
+        
+        When searching for flights:
+        1. Use Google Search to find REAL current flight prices and availability
+        2. Search for flights on major booking sites (Google Flights, Kayak, Skyscanner)
+        3. Include airline names, departure/arrival times, duration, and current prices
+        4. Compare multiple options when available
+        5. Mention if prices are approximate and suggest booking sites
+        
+        Always provide actual, current data from your searches, not placeholder information.""",
+        description="Handles flight-related queries with real-time price data"
+    )
+
+@functools.cache
+def get_hotel_agent() -> LlmAgent:
+    """Hotel specialist agent (built once)."""
+    return make_domain_agent(
+        name="HotelAgent",
+        instruction="""You handle hotel bookings and recommendations.
+        
+        When searching for hotels:
+        1. Use Google Search to find REAL current hotel prices and availability
+        2. Search on Booking.com, Hotels.com, Expedia, or hotel websites
+        3. Include hotel names, ratings, amenities, location details, and current prices per night
+        4. Provide multiple options at different price points
+        5. Include guest ratings and reviews when available
+        
+        Always provide actual, current data from your searches, not placeholder information.""",
+        description="Handles hotel-related queries with real-time price data"
+    )
+
+@functools.cache
+def get_activity_agent() -> LlmAgent:
+    """Activity specialist agent (built once)."""
+    return make_domain_agent(
+        name="ActivityAgent",
+        instruction="""You suggest tourist activities and attractions.
+        
+        When suggesting activities:
+        1. Use Google Search to find current information about attractions
+        2. Include opening hours, ticket prices, and booking requirements
+        3. Recommend based on season, weather, and current events
+        4. Provide links to official websites or booking platforms
+        5. Suggest both popular and hidden gem locations
+        
+        Always provide actual, current data from your searches.""",
+        description="Suggests activities with real-time information"
+    )
+
+@functools.cache
+def get_flight_tool() -> AgentTool:
+    """Flight agent wrapped as a tool for the coordinator (built once)."""
+    return AgentTool(agent=get_flight_agent())
+
+@functools.cache
+def get_hotel_tool() -> AgentTool:
+    """Hotel agent wrapped as a tool for the coordinator (built once)."""
+    return AgentTool(agent=get_hotel_agent())
+
+@functools.cache
+def get_activity_tool() -> AgentTool:
+    """Activity agent wrapped as a tool for the coordinator (built once)."""
+    return AgentTool(agent=get_activity_agent())
+
+# Coordinator agent
+@functools.cache
+def get_root_agent() -> LlmAgent:
+    """Travel coordinator delegating to the specialist tools (built once)."""
+    return LlmAgent(
+        name="TravelCoordinator",
+        model=_MODEL,
+        instruction="""You are a travel coordinator. Analyze the user's request and:
+        
+        1. Identify all components needed (flights, hotels, activities)
+        2. Delegate to appropriate specialist agents:
+           - FlightAgent for flights and transportation
+           - HotelAgent for accommodations
+           - ActivityAgent for things to do
+        3. Coordinate multiple agents when the request involves multiple aspects.
+           Their tasks are independent, so call every needed agent in the same
+           response instead of waiting for one before calling the next
+        4. Synthesize responses from sub-agents into a cohesive travel plan
+        5. Provide a summary with total estimated costs
+        
+        Ensure all sub-agents use Google Search to provide REAL, current prices and information.""",
+        description="Coordinates travel planning across multiple agents",
+        # Function calls returned together in one response are run concurrently by ADK
+        tools=[get_flight_tool(), get_hotel_tool(), get_activity_tool()],
+        # sub_agents=[flight_agent, hotel_agent, activity_agent],
+        # tools=[google_search]
+    )
+
+@functools.cache
+def get_session_service() -> InMemorySessionService:
+    """Session service shared by the travel assistant runner (built once)."""
+    return InMemorySessionService()
+
+@functools.cache
+def get_runner() -> Runner:
+    """Runner for the travel assistant (built once)."""
+    return Runner(
+        agent=get_root_agent(),
+        app_name="travel_assistant",
+        session_service=get_session_service()
+    )
+
+# Module attributes kept for ADK agent discovery (`root_agent`) and older callers
+_LAZY_ATTRS = {
+    "flight_agent": get_flight_agent,
+    "hotel_agent": get_hotel_agent,
+    "activity_agent": get_activity_agent,
+    "flight_tool": get_flight_tool,
+    "hotel_tool": get_hotel_tool,
+    "activity_tool": get_activity_tool,
+    "root_agent": get_root_agent,
+    "session_service": get_session_service,
+    "runner": get_runner,
+}
+
+def __getattr__(name: str):
+    """Build lazily-initialized module attributes on first access."""
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class TokenBucket:
+    """
+    Client-side token bucket that paces requests before they are sent.
     
-    Always provide actual, current data from your searches, not placeholder information.""",
-    description="Handles hotel-related queries with real-time price data",
-    tools=[google_search]
-)
-
-activity_agent = LlmAgent(
-    name="ActivityAgent",
-    model="gemini-2.5-flash",
-    instruction="""You suggest tourist activities and attractions.
+    One token is charged per acquire(); run_with_rate_limit_handling charges
+    one per agent run, not per underlying Gemini API call.
     
-    When suggesting activities:
-    1. Use Google Search to find current information about attractions
-    2. Include opening hours, ticket prices, and booking requirements
-    3. Recommend based on season, weather, and current events
-    4. Provide links to official websites or booking platforms
-    5. Suggest both popular and hidden gem locations
+    The refill rate adapts AIMD-style: it halves on every rate limit error and
+    grows back additively after a run of successful calls, so the client
+    settles just under the server's quota instead of repeatedly hitting 429s.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        min_rate: Optional[float] = None,
+        increase_every: int = 5
+    ):
+        """
+        Args:
+            rate: Tokens added per second, i.e. the target acquire() rate
+            capacity: Maximum number of acquire() calls allowed in a burst
+            min_rate: Floor for the rate after repeated backoffs (defaults to rate / 2,
+                so a burst of 429s cannot stretch pacing waits out to many minutes)
+            increase_every: Successful calls needed before the rate grows again
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        if increase_every < 1:
+            raise ValueError("increase_every must be at least 1")
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 2
+        self.capacity = capacity
+        self.increase_every = increase_every
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            print(f"\n⚠️  Pacing: waiting {wait:.1f} seconds before the next run...")
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Additively raise the rate after enough consecutive successes."""
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.increase_every:
+                self._successes = 0
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 4)
+
+    def on_rate_limited(self) -> None:
+        """Multiplicatively cut the rate after a 429."""
+        with self._lock:
+            self._successes = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+
+@functools.cache
+def get_token_bucket() -> TokenBucket:
+    """
+    Shared opt-in pacing bucket: 2 agent runs per minute, bursts of up to 2 (built once).
     
-    Always provide actual, current data from your searches.""",
-    description="Suggests activities with real-time information",
-    tools=[google_search]
-)
-flight_tool = AgentTool(agent=flight_agent)
-hotel_tool = AgentTool(agent=hotel_agent)
-activity_tool = AgentTool(agent=activity_agent)
+    A travel run makes several model calls (coordinator turns plus one LLM and
+    search per AgentTool), so 2 runs/min keeps roughly within a 10 RPM quota.
+    Pass it as `token_bucket` to run_with_rate_limit_handling for batch jobs;
+    interactive chat is not paced by default.
+    """
+    return TokenBucket(rate=2 / 60, capacity=2)
 
-# Coordinator agent
-root_agent = LlmAgent(
-    name="TravelCoordinator",
-    model="gemini-2.5-flash",
-    instruction="""You are a travel coordinator. Analyze the user's request and:
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Extract the server-suggested wait from a rate limit error, if any.
     
-    1. Identify all components needed (flights, hotels, activities)
-    2. Delegate to appropriate specialist agents:
-       - FlightAgent for flights and transportation
-       - HotelAgent for accommodations
-       - ActivityAgent for things to do
-    3. Coordinate multiple agents when the request involves multiple aspects
-    4. Synthesize responses from sub-agents into a cohesive travel plan
-    5. Provide a summary with total estimated costs
+    Looks for a `retry_after` attribute first, then a numeric `Retry-After`
+    header on the underlying HTTP response.
     
-    Ensure all sub-agents use Google Search to provide REAL, current prices and information.""",
-    description="Coordinates travel planning across multiple agents",
-    tools=[flight_tool, hotel_tool, activity_tool],
-    # sub_agents=[flight_agent, hotel_agent, activity_agent],
-    # tools=[google_search]
-)
+    Returns:
+        The delay in seconds, or None if the server did not suggest one
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is not None:
+            retry_after = headers.get("Retry-After")
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        # HTTP-date values are not worth parsing here; fall back to jitter
+        return None
 
 def run_with_rate_limit_handling(
     runner: Runner,
@@ -94,7 +292,9 @@ def run_with_rate_limit_handling(
     session_id: str,
     new_message: types.Content,
     max_retries: int = 3,
-    base_delay: int = 60
+    base_delay: int = 60,
+    max_delay: int = 600,
+    token_bucket: Optional[TokenBucket] = None
 ) -> Iterator:
     """
     Run the agent with automatic rate limit (429) handling.
@@ -105,15 +305,28 @@ def run_with_rate_limit_handling(
         session_id: Session identifier
         new_message: The message content to send
         max_retries: Maximum number of retry attempts
-        base_delay: Base delay in seconds (doubles with each retry)
+        base_delay: Minimum jittered delay in seconds between retries (a shorter
+            server Retry-After is honored as given)
+        max_delay: Upper bound in seconds for a single backoff delay
+        token_bucket: Optional bucket charged once per runner.run attempt, pacing
+            whole runs rather than individual API calls (None disables pacing;
+            see get_token_bucket())
     
     Yields:
-        Events from the runner
+        Events from the runner. A rate limit error that arrives after events
+        were already yielded is re-raised rather than retried, since resending
+        the message would start a different answer in the same session.
     """
     retries = 0
+    prev_delay = base_delay
+    emitted = False  # Whether this attempt already handed events to the caller
+    bucket = token_bucket
     
     while retries <= max_retries:
         try:
+            # When pacing is enabled, wait for a token first so we rarely get throttled
+            if bucket is not None:
+                bucket.acquire()
             events = runner.run(
                 user_id=user_id,
                 session_id=session_id,
@@ -122,40 +335,55 @@ def run_with_rate_limit_handling(
             
             # Yield all events
             for event in events:
+                emitted = True
                 yield event
             
             # If we successfully completed, break the retry loop
+            if bucket is not None:
+                bucket.on_success()
             break
             
         except Exception as e:
-            error_msg = str(e)
+            # Check if it's a 429 rate limit error, trusting the typed status code
+            # first so the message is only stringified for untyped errors
+            is_rate_limited = (
+                (isinstance(e, errors.APIError) and e.code == 429)
+                or _RATE_LIMIT_RE.search(str(e)) is not None
+            )
             
-            # Check if it's a 429 rate limit error
-            if "429" in error_msg or "rate limit" in error_msg.lower() or "quota" in error_msg.lower():
+            if is_rate_limited:
+                if bucket is not None:
+                    bucket.on_rate_limited()
                 retries += 1
                 
+                if emitted:
+                    # Retrying would resend the message and mix a fresh answer
+                    # into the partial one the caller already has
+                    print("\n❌ Rate limit hit (429) mid-response. Not retrying a partially delivered answer.")
+                    raise
+                
                 if retries > max_retries:
                     print(f"\n❌ Max retries ({max_retries}) reached. Please try again later.")
                     raise
                 
-                # Exponential backoff
-                delay = base_delay * (2 ** (retries - 1))
-                print(f"\n⚠️  Rate limit hit (429). Waiting {delay} seconds before retry {retries}/{max_retries}...")
+                # Honor Retry-After when given, otherwise use decorrelated jitter
+                # so clients sharing a quota don't retry in lockstep
+                retry_after = _retry_after_seconds(e)
+                if retry_after is not None:
+                    # Honor the server's hint as given, only guarding against
+                    # negative values and capping it at max_delay
+                    delay = max(0.0, min(max_delay, retry_after))
+                else:
+                    delay = min(max_delay, random.uniform(base_delay, prev_delay * 3))
+                prev_delay = max(base_delay, delay)
+                print(f"\n⚠️  Rate limit hit (429). Waiting {delay:.1f} seconds before retry {retries}/{max_retries}...")
                 time.sleep(delay)
                 
             else:
                 # If it's not a rate limit error, raise it immediately
-                print(f"\n❌ Error occurred: {error_msg}")
+                print(f"\n❌ Error occurred: {e}")
                 raise
 
-# Initialize session service and runner
-session_service = InMemorySessionService()
-runner = Runner(
-    agent=root_agent,
-    app_name="travel_assistant",
-    session_service=session_service
-)
-
 # Example usage
 if __name__ == "__main__":
     print("🌍 Travel Assistant with Real-Time Data\n")
@@ -176,7 +404,7 @@ if __name__ == "__main__":
     try:
         # Run with automatic rate limit handling
         events = run_with_rate_limit_handling(
-            runner=runner,
+            runner=get_runner(),
             user_id="traveler_1",
             session_id="trip_1",
             new_message=content,
@@ -185,13 +413,20 @@ if __name__ == "__main__":
         )
         
         print("\n📋 Travel Plan:\n")
+        write, flush = sys.stdout.write, sys.stdout.flush
         for event in events:
-            if event.content and event.content.parts:
-                text = event.content.parts[0].text
-                if text.strip():  # Only print non-empty responses
-                    print(f"[{event.author}]:")
-                    print(f"{text}")
-                    print("-" * 60)
+            try:
+                parts = _parts_of(event)
+            except AttributeError:
+                continue
+            if not parts:
+                continue
+            text = parts[0].text
+            if not text or text.isspace():  # Only print non-empty responses
+                continue
+            # One buffered write per event, flushed so each response shows immediately
+            write(f"[{event.author}]:\n{text}\n{_DIVIDER}")
+            flush()
         
         print("\n✅ Travel planning completed successfully!")
         
@@ -199,6 +434,22 @@ if __name__ == "__main__":
         print(f"\n❌ Failed to complete travel planning: {e}")
         print("Please try again later or contact support.")
 
+def _ensure_session(runner: Runner, user_id: str, session_id: str) -> None:
+    """
+    Make sure the session exists before the first turn, creating it if needed.
+    """
+    async def _get_or_create():
+        service = runner.session_service
+        session = await service.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            await service.create_session(
+                app_name=runner.app_name, user_id=user_id, session_id=session_id
+            )
+
+    asyncio.run(_get_or_create())
+
 # Additional helper function for continuous conversation
 def chat_with_agent(runner: Runner, user_id: str, session_id: str):
     """
@@ -207,6 +458,9 @@ def chat_with_agent(runner: Runner, user_id: str, session_id: str):
     print("\n💬 Interactive Travel Planning Session")
     print("Type 'exit' or 'quit' to end the session\n")
     
+    # Bootstrap the session once up front instead of rediscovering it every turn
+    _ensure_session(runner, user_id, session_id)
+    
     while True:
         user_input = input("You: ").strip()
         
@@ -217,9 +471,8 @@ def chat_with_agent(runner: Runner, user_id: str, session_id: str):
         if not user_input:
             continue
         
-        content = types.Content(
-            role='user',
-            parts=[types.Part(text=user_input)]
+        content = _user_content(
+            parts=[_TEXT_PART_PROTO.model_copy(update={'text': user_input})]
         )
         
         try:
@@ -231,15 +484,22 @@ def chat_with_agent(runner: Runner, user_id: str, session_id: str):
             )
             
             print("\nAgent: ", end="")
+            write, flush = sys.stdout.write, sys.stdout.flush
             for event in events:
-                if event.content and event.content.parts:
-                    text = event.content.parts[0].text
-                    if text.strip():
-                        print(text)
+                try:
+                    parts = _parts_of(event)
+                except AttributeError:
+                    continue
+                if not parts:
+                    continue
+                text = parts[0].text
+                if text and not text.isspace():
+                    write(text + "\n")
+                    flush()
             print()
             
         except Exception as e:
             print(f"❌ Error: {e}\n")
 
 # Uncomment to use interactive mode:
-# chat_with_agent(runner, "traveler_1", "trip_1")
\ No newline at end of file
+# chat_with_agent(get_runner(), "traveler_1", "trip_1")
\ No newline at end of file
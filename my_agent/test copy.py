@@ -1,5 +1,14 @@
+import functools
 import math
-from typing import Optional
+
+try:
+    # GMP's factorial is several times faster than CPython ints for large n
+    from gmpy2 import fac as _gmpy2_fac
+except ImportError:
+    _gmpy2_fac = None
+
+# math.factorial answers n <= 20 from a lookup table; gmpy2 only pays off above that
+_GMPY2_MIN_N = 21
 
 class Factorial:
     """
@@ -9,6 +18,8 @@ class Factorial:
         number (int): The integer for which the factorial is to be calculated.
     """
 
+    __slots__ = ("_number", "_hash") # No per-instance __dict__
+
     def __init__(self, n: int):
         """
         Initializes the Factorial object with a given number.
@@ -18,39 +29,48 @@ class Factorial:
 
         Raises:
             ValueError: If n is negative.
-            TypeError: If n is not an integer.
+            TypeError: If n is not an integer (bool is rejected too).
         """
-        if not isinstance(n, int):
+        if type(n) is not int:
             raise TypeError("Input must be an integer.")
         if n < 0:
             raise ValueError("Factorial is not defined for negative numbers.")
         self._number: int = n
-        self._factorial_result: Optional[int] = None # Cache the result
+        self._hash: int = hash(n) # Cached for fast set/dict probes
 
     @property
     def number(self) -> int:
         """Returns the number for which the factorial is calculated."""
         return self._number
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _cached(n: int) -> int:
+        """
+        Computes n! once and shares the result across all Factorial instances.
+        Uses gmpy2.fac for large n when gmpy2 is installed, otherwise math.factorial.
+
+        Args:
+            n (int): The non-negative integer to calculate the factorial for.
+
+        Returns:
+            int: The factorial of n.
+        """
+        if _gmpy2_fac is not None and n >= _GMPY2_MIN_N:
+            return int(_gmpy2_fac(n))
+        return math.factorial(n)
+
     def calculate(self) -> int:
         """
         Calculates the factorial of the stored number.
-        Uses an iterative approach for efficiency and to avoid recursion depth limits.
+        Uses math.factorial (or gmpy2.fac for large n when available), both far
+        faster than a Python-level multiplication loop. Results are cached per
+        number at class level, so equal instances never recompute.
 
         Returns:
             int: The factorial of the number.
         """
-        if self._factorial_result is not None:
-            return self._factorial_result # Return cached result
-
-        if self._number == 0:
-            self._factorial_result = 1
-        else:
-            result = 1
-            for i in range(1, self._number + 1):
-                result *= i
-            self._factorial_result = result
-        return self._factorial_result
+        return Factorial._cached(self._number)
 
     def __call__(self) -> int:
         """
@@ -91,25 +111,22 @@ class Factorial:
         """
         Computes the hash of the Factorial object based on its number.
         This allows Factorial objects to be used in sets or as dictionary keys.
+        The hash is computed once in __init__ since the number never changes.
 
         Returns:
             int: The hash value of the object.
         """
-        return hash(self.number)
+        return self._hash
 
     def using_math_module(self) -> int:
         """
         Calculates the factorial using Python's built-in math.factorial function.
-        This method is provided for comparison/demonstration.
+        This method is provided for comparison/demonstration and bypasses the
+        shared cache and the optional gmpy2 path used by calculate().
 
         Returns:
             int: The factorial of the number.
         """
-        # Our __init__ already validates for n < 0, so this check is technically
-        # redundant in a well-constructed object, but harmless if the object
-        # state were somehow corrupted externally.
-        if self._number < 0:
-            raise ValueError("math.factorial() not defined for negative values")
         return math.factorial(self._number)
 
 
@@ -151,6 +168,13 @@ if __name__ == "__main__":
     except (ValueError, TypeError) as e:
         print(f"Attempted Factorial(4.5): Caught error: {e}")
 
+    # Example 4b: Invalid input - bool is not accepted as an integer
+    try:
+        f_bool = Factorial(True)
+        print(f"Factorial of {f_bool.number}: {f_bool.calculate()}")
+    except (ValueError, TypeError) as e:
+        print(f"Attempted Factorial(True): Caught error: {e}")
+
     # Example 5: Larger number
     try:
         f10 = Factorial(10)
@@ -2,7 +2,7 @@ import time
 import functools
 import logging
 import random
-from typing import Callable, Tuple, Type, Union
+from typing import Callable, Iterator, Optional, Tuple, Type, Union
 
 # Configure a default logger for the module if no custom logger is provided
 # In a real application, you'd typically configure logging globally.
@@ -15,6 +15,153 @@ if not logger.handlers: # Avoid adding handlers multiple times if module is relo
     logger.addHandler(handler)
 
 
+class Attempt:
+    """
+    A single try inside a Retrying loop, used as a context manager.
+
+    Exceptions matching the Retrying configuration are swallowed and recorded
+    while tries remain, so the loop can back off and try again. On the last
+    try, or for any other exception, the error propagates unchanged.
+    """
+
+    __slots__ = ("_exceptions", "tries_left", "error")
+
+    def __init__(self, exceptions: Tuple[Type[Exception], ...], tries_left: int):
+        self._exceptions = exceptions
+        self.tries_left = tries_left
+        self.error: Optional[BaseException] = None
+
+    def __enter__(self) -> "Attempt":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None or not self.tries_left or not issubclass(exc_type, self._exceptions):
+            return False
+        self.error = exc
+        return True
+
+
+def _check_retry_args(
+    tries: int,
+    delay: Union[int, float],
+    backoff: Union[int, float],
+    exceptions: Tuple[Type[Exception], ...],
+) -> None:
+    """Validate the retry policy arguments shared by Retrying and @retry."""
+    if tries < 1:
+        raise ValueError("tries must be at least 1")
+    if delay < 0:
+        raise ValueError("delay must be non-negative")
+    if backoff < 1:
+        raise ValueError("backoff must be at least 1")
+    if not isinstance(exceptions, tuple):
+        raise TypeError("exceptions must be a tuple of Exception types")
+
+
+class Retrying:
+    """
+    Reusable retry policy that can drive a loop directly or back the @retry decorator.
+
+    Iterating yields Attempt context managers; the loop stops after the first
+    attempt whose block completes without a retryable error:
+
+        for attempt in Retrying(tries=3, delay=0.5):
+            with attempt:
+                result = fetch()
+
+    Args:
+        tries (int): Number of attempts to make (including the first one).
+        delay (Union[int, float]): Initial delay in seconds between retries.
+        backoff (Union[int, float]): Multiplier by which the delay increases after each failed attempt.
+        exceptions (Tuple[Type[Exception], ...]): A tuple of exception types to catch and retry on.
+                                            If any other exception is raised, it will not be retried.
+        logger (logging.Logger): The logger instance to use for retry messages.
+        jitter (Union[int, float]): Maximum random jitter to add to the delay.
+                                    If jitter > 0 and jitter < 1, it's a percentage (e.g., 0.1 for 10%).
+                                    If jitter >= 1, it's an absolute value in seconds.
+        name (str): Label used in retry log messages.
+    """
+
+    def __init__(
+        self,
+        tries: int = 3,
+        delay: Union[int, float] = 1,
+        backoff: Union[int, float] = 2,
+        exceptions: Tuple[Type[Exception], ...] = (Exception,),
+        logger: logging.Logger = logger, # Allow custom logger
+        jitter: Union[int, float] = 0, # Max percentage/absolute value of jitter to add to delay
+        name: str = "block",
+    ):
+        _check_retry_args(tries, delay, backoff, exceptions)
+
+        self.tries = tries
+        self.delay = delay
+        self.backoff = backoff
+        self.exceptions = exceptions
+        self.logger = logger
+        self.jitter = jitter
+        self.name = name
+        # Resolve the jitter mode once instead of on every failed attempt
+        self._use_jitter = jitter > 0
+        self._jitter_is_pct = 0 < jitter < 1 # Percentage of the delay vs. absolute seconds
+        # Bind hot callables once so each retry skips module/attribute lookups
+        self._rand_uniform = random.uniform
+        self._sleep = time.sleep
+        self._monotonic_ns = time.monotonic_ns
+        self._log_warning = logger.warning
+
+    def __iter__(self) -> Iterator[Attempt]:
+        return self._attempts()
+
+    def _attempts(self, first_error: Optional[BaseException] = None) -> Iterator[Attempt]:
+        """
+        Yield attempts until one succeeds or the tries run out.
+
+        Args:
+            first_error (Optional[BaseException]): Error from a first try made outside
+                the loop (the @retry fast path); iteration resumes with its backoff.
+        """
+        exceptions, backoff, wait = self.exceptions, self.backoff, self.wait
+        mdelay = self.delay
+        tries_left = self.tries - 1
+        error = first_error
+        while True:
+            if error is not None:
+                wait(error, tries_left, mdelay)
+                mdelay *= backoff
+                tries_left -= 1
+            attempt = Attempt(exceptions, tries_left)
+            yield attempt
+            error = attempt.error
+            if error is None:
+                return
+
+    def wait(self, error: BaseException, tries_left: int, base_delay: Union[int, float]) -> None:
+        """
+        Log the failure and sleep before the next attempt.
+
+        Args:
+            error (BaseException): The exception that caused the retry.
+            tries_left (int): Attempts remaining after the failed one.
+            base_delay (Union[int, float]): Backoff delay before jitter is applied.
+        """
+        # Calculate actual sleep delay with jitter
+        current_delay = base_delay
+        if self._use_jitter:
+            jitter = self.jitter
+            current_delay += self._rand_uniform(0, current_delay * jitter if self._jitter_is_pct else jitter)
+
+        self._log_warning(
+            f"Retrying {self.name!r} in {current_delay:.2f} seconds... "
+            f"({tries_left} tries left) due to: {type(error).__name__}: {error}"
+        )
+        # Sleep against a monotonic deadline so an early wake-up can't shorten the backoff
+        sleep, monotonic_ns = self._sleep, self._monotonic_ns
+        deadline_ns = monotonic_ns() + int(current_delay * 1_000_000_000)
+        while (remaining_ns := deadline_ns - monotonic_ns()) > 0:
+            sleep(remaining_ns / 1_000_000_000)
+
+
 def retry(
     tries: int = 3,
     delay: Union[int, float] = 1,
@@ -26,6 +173,9 @@ def retry(
     """
     Decorator to retry a function if it raises specific exceptions.
 
+    Thin wrapper over Retrying: the first call is made directly, and only after
+    it fails are the remaining attempts handed to the Retrying iterator.
+
     Args:
         tries (int): Number of attempts to make (including the first one).
         delay (Union[int, float]): Initial delay in seconds between retries.
@@ -37,47 +187,32 @@ def retry(
                                     If jitter > 0 and jitter < 1, it's a percentage (e.g., 0.1 for 10%).
                                     If jitter >= 1, it's an absolute value in seconds.
     """
-    if tries < 1:
-        raise ValueError("tries must be at least 1")
-    if delay < 0:
-        raise ValueError("delay must be non-negative")
-    if backoff < 1:
-        raise ValueError("backoff must be at least 1")
-    if not isinstance(exceptions, tuple):
-        raise TypeError("exceptions must be a tuple of Exception types")
+    _check_retry_args(tries, delay, backoff, exceptions)
 
     def deco_retry(f: Callable) -> Callable:
+        retrying = Retrying(tries, delay, backoff, exceptions, logger, jitter, name=f.__name__)
+        resume = retrying._attempts
+        single_try = tries == 1
+
         @functools.wraps(f)
         def f_retry(*args, **kwargs):
-            mtries, mdelay = tries, delay
-            while mtries > 1:
-                try:
+            # Fast path: a successful first call costs one try block, no generator
+            try:
+                return f(*args, **kwargs)
+            except exceptions as e:
+                if single_try:
+                    raise
+                first_error = e
+
+            # The last attempt re-raises from its `with` block, so this loop
+            # always returns or raises
+            for attempt in resume(first_error):
+                with attempt:
                     return f(*args, **kwargs)
-                except exceptions as e:
-                    # Calculate actual sleep delay with jitter
-                    current_delay = mdelay
-                    if jitter > 0:
-                        if jitter < 1: # Interpret as percentage
-                            jitter_amount = random.uniform(0, current_delay * jitter)
-                        else: # Interpret as absolute value
-                            jitter_amount = random.uniform(0, jitter)
-                        current_delay += jitter_amount
-
-                    logger.warning(
-                        f"Retrying {f.__name__!r} in {current_delay:.2f} seconds... "
-                        f"({mtries - 1} tries left) due to: {type(e).__name__}: {e}"
-                    )
-                    time.sleep(current_delay)
-                    mtries -= 1
-                    mdelay *= backoff
-            
-            # Last attempt outside the loop to re-raise if it fails
-            return f(*args, **kwargs)
 
         return f_retry
     return deco_retry
 
-
 if __name__ == '__main__':
     # Ensure the default logger shows INFO messages in the example output
     # if it hasn't been configured by the application already.
@@ -149,4 +284,17 @@ if __name__ == '__main__':
     try:
         always_fails()
     except RuntimeError as e:
-        logger.error(f"always_fails finally failed as expected: {e}\n")
\ No newline at end of file
+        logger.error(f"always_fails finally failed as expected: {e}\n")
+
+
+    # Example 4: Retrying a block inline, without wrapping it in a function
+    logger.info("--- Testing Retrying loop ---")
+    block_attempts = 0
+    for attempt in Retrying(tries=3, delay=0.1, name="inline block"):
+        with attempt:
+            block_attempts += 1
+            logger.info(f"  Attempt {block_attempts} for inline block...")
+            if block_attempts < 2:
+                raise ConnectionError("Simulated transient failure!")
+            logger.info("  Inline block succeeded!")
+    logger.info(f"Inline block finished after {block_attempts} attempts\n")
\ No newline at end of file